@@ -1,16 +1,26 @@
+import hashlib
+import hmac
 import os
+import sqlite3
+import click
+import orjson
+import redis
 from dotenv import load_dotenv
 
 # --- Load environment variables from a .env file into os.environ ---
 load_dotenv()  # allows accessing variables like FLASK_SECRET_KEY, LDAP_SERVER, etc.
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, g, abort, has_request_context
+from flask_compress import Compress
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import (LoginManager, login_user, logout_user, login_required, current_user)
 from flask_login import UserMixin
-from sqlalchemy import and_, or_
+from flask_session import Session
+from sqlalchemy import and_, or_, case, event, func, lambda_stmt, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload, make_transient_to_detached, raiseload
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask_ldap3_login import LDAP3LoginManager  # LDAP authentication integration
+from flask_ldap3_login import LDAP3LoginManager, AuthenticationResponseStatus  # LDAP authentication integration
 
 # --- Initialize Flask application ---
 app = Flask(
@@ -24,9 +34,57 @@ app.secret_key = os.environ.get("FLASK_SECRET_KEY")  # secret key for sessions,
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("SQLALCHEMY_DATABASE_URI")  # database connection
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = os.environ.get("SQLALCHEMY_TRACK_MODIFICATIONS") == "True"
 
+# Connection pool settings
+if (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("sqlite"):
+    # SQLite file connections can't go stale, so no pre-ping/recycle (it would cost a SELECT 1 per checkout)
+    engine_options = {"connect_args": {"check_same_thread": False}}  # pooled connections move between threads
+else:
+    engine_options = {
+        "pool_pre_ping": True,  # replace dropped server connections before use
+        "pool_recycle": 1800,   # recycle long-idle connections
+        "pool_size": 10,        # bound concurrent server connections
+        "max_overflow": 20
+    }
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+
+# --- Optional Redis (set REDIS_URL): server-side sessions and cached user rows ---
+redis_client = redis.Redis.from_url(os.environ["REDIS_URL"]) if os.environ.get("REDIS_URL") else None
+if redis_client is not None:
+    app.config["SESSION_TYPE"] = "redis"
+    app.config["SESSION_REDIS"] = redis_client
+    Session(app)  # sessions live in Redis instead of a signed cookie
+
+# --- Response compression (gzip/brotli) for HTML pages and the JSON events feed ---
+app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/html"]
+Compress(app)
+
 # --- Initialize SQLAlchemy database ---
 db = SQLAlchemy(app)
 
+# --- SQLite tuning: WAL journal so readers don't block writers, and NORMAL sync to avoid an fsync per commit ---
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return  # only applies to SQLite databases
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=134217728")  # 128 MB
+    cursor.close()
+
+# --- Debug only: count SQL statements per request and report them in an X-SQL-Query-Count header ---
+if app.debug:
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count_sql_queries(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.sql_query_count = g.get("sql_query_count", 0) + 1
+
+    @app.after_request
+    def add_sql_query_count_header(response):
+        response.headers["X-SQL-Query-Count"] = str(g.get("sql_query_count", 0))
+        return response
+
 # --- Setup Flask-Login for user session management ---
 login_manager = LoginManager()
 login_manager.login_view = "login"  # redirect unauthenticated users to /login
@@ -52,31 +110,26 @@ class User(db.Model):
     role = db.Column(db.String(20), nullable=False, default="user")  # user role (user/admin)
     team_id = db.Column(db.Integer, db.ForeignKey("team.id"), nullable=True)  # optional team assignment
     is_ldap = db.Column(db.Boolean, default=False)  # flag for LDAP users
+    team = db.relationship("Team", back_populates="users")  # team the user belongs to
+    events = db.relationship("Event", back_populates="creator", lazy="raise")  # events created by the user
 
     def check_password(self, password):
         """Verify password against stored hash. Returns False if no local password."""
-        if not self.password_hash:
+        # Reject empty passwords and missing/malformed hashes before running the costly KDF
+        if not password or not self.password_hash or len(self.password_hash) < 20:
             return False
         return check_password_hash(self.password_hash, password)
 
-    # Flask-Login required properties
-    @property
-    def is_authenticated(self):
-        return True
-
-    @property
-    def is_active(self):
-        return True
-
-    @property
-    def is_anonymous(self):
-        return False
+    # Flask-Login required attributes (constants, so plain class attributes instead of properties)
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
 
     def get_id(self):
         return str(self.id)
 
 # Event model to track calendar events
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class Event(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -86,20 +139,63 @@ class Event(db.Model):
     start_datetime = db.Column(db.DateTime, nullable=False)  # start time
     end_datetime = db.Column(db.DateTime, nullable=False)    # end time
     created_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)  # user who created it
-    creator = db.relationship("User", backref="events")  # relationship to User model
+    creator = db.relationship("User", back_populates="events")  # relationship to User model
     scope = db.Column(db.String(20), nullable=False, default="personal")  # personal/team/global
     team_id = db.Column(db.Integer, db.ForeignKey("team.id"), nullable=True)  # optional team association
 
+    # Indexes backing the hot filters in /api/events and /pending_vacations
+    __table_args__ = (
+        db.Index("ix_event_type_status", "event_type", "status"),  # pending vacations
+        db.Index("ix_event_creator", "created_by"),  # user's own events
+        db.Index("ix_event_team_scope_status", "team_id", "scope", "status"),  # approved team events
+        db.Index("ix_event_start_datetime", "start_datetime"),  # /api/events visible-range filter
+    )
+
 # Team model
 class Team(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
-    users = db.relationship("User", backref="team", lazy=True)  # back reference to users
+    users = db.relationship("User", back_populates="team", lazy="raise")  # users in this team
 
 # --- Flask-Login user loader ---
+USER_CACHE_TTL = 300  # seconds a user row stays cached in Redis
+USER_CACHE_FIELDS = ("id", "username", "role", "team_id", "is_ldap")  # columns needed for current_user
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))  # load user by ID for session management
+    # Load each user ID at most once per request (keyed, so a different ID is never served the
+    # wrong user); Session.get() checks the identity map before querying, and the team is
+    # joined in so later current_user.team access needs no extra SELECT
+    user_cache = g.setdefault("user_cache", {})
+    if user_id not in user_cache:
+        user = None
+        cache_key = f"user:{user_id}"
+
+        if redis_client is not None:
+            try:
+                cached = redis_client.get(cache_key)
+            except redis.RedisError:
+                cached = None  # cache outage: fall back to the database
+            if cached:
+                # Rebuild the row from Redis and attach it to the session as persistent, without a SELECT
+                user = User(**orjson.loads(cached))
+                make_transient_to_detached(user)
+                user = db.session.merge(user, load=False)
+
+        if user is None:
+            user = db.session.get(User, int(user_id), options=[joinedload(User.team)])
+            if user is not None and redis_client is not None:
+                try:
+                    redis_client.setex(
+                        cache_key,
+                        USER_CACHE_TTL,
+                        orjson.dumps({field: getattr(user, field) for field in USER_CACHE_FIELDS})
+                    )
+                except redis.RedisError:
+                    pass  # caching is best-effort
+
+        user_cache[user_id] = user
+    return user_cache[user_id]
 
 # --- Routes ---
 @app.route("/")
@@ -111,6 +207,15 @@ def home():
 
 import time  # used later if needed (currently unused)
 
+LDAP_AUTH_CACHE_TTL = 300  # seconds a successful LDAP bind is remembered in Redis
+
+def ldap_cache_key(username, password):
+    """Redis key for a successful LDAP login; an HMAC so credentials are never stored."""
+    digest = hmac.new(
+        app.secret_key.encode(), f"{username}:{password}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"ldap:{digest}"
+
 # Login route
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -120,7 +225,7 @@ def login():
 
         # --- Try to authenticate local user first ---
         local_user = User.query.filter_by(username=username).first()
-        if local_user:
+        if local_user and not local_user.is_ldap:
             if local_user.check_password(password):
                 login_user(local_user)  # log in user
                 flash("Logged in locally", "success")
@@ -129,29 +234,58 @@ def login():
                 flash("Invalid password", "danger")
                 return render_template("login.html")
 
-        # --- If no local user, try LDAP authentication ---
+        # --- LDAP users (and unknown users) authenticate against LDAP ---
+        # The cache key is an HMAC under the secret key, so caching needs both Redis and FLASK_SECRET_KEY
+        cache_key = (
+            ldap_cache_key(username, password)
+            if redis_client is not None and app.secret_key
+            else None
+        )
         try:
-            ldap_user = ldap_manager.authenticate(username, password)
-        except Exception:
-            ldap_user = None
-
-        if ldap_user:
-            # First successful LDAP login → create local user record
-            new_user = User(
-                username=username,
-                password_hash=generate_password_hash(password),  # optional local password
-                role="user",
-                is_ldap=True
-            )
-            db.session.add(new_user)
-            db.session.commit()
+            cached_ok = bool(cache_key and redis_client.get(cache_key))
+        except redis.RedisError:
+            cached_ok = False  # cache outage: ask LDAP directly
 
-            login_user(new_user)
-            flash("Logged in via LDAP (local account created)", "success")
+        if cached_ok:
+            ldap_ok = True  # same credentials verified against LDAP within the last few minutes
+        else:
+            try:
+                ldap_result = ldap_manager.authenticate(username, password)
+                ldap_ok = ldap_result.status == AuthenticationResponseStatus.success
+            except Exception:
+                ldap_ok = False
+
+            # Only successes are cached; failures always go back to LDAP
+            if ldap_ok and cache_key:
+                try:
+                    redis_client.setex(cache_key, LDAP_AUTH_CACHE_TTL, 1)
+                except redis.RedisError:
+                    pass  # caching is best-effort
+
+        if ldap_ok:
+            if not local_user:
+                # First successful LDAP login → create local user record.
+                # No local password is stored: LDAP stays authoritative, so hashing it would be wasted work.
+                local_user = User(
+                    username=username,
+                    password_hash=None,
+                    role="user",
+                    is_ldap=True
+                )
+                db.session.add(local_user)
+                db.session.commit()
+                flash("Logged in via LDAP (local account created)", "success")
+            else:
+                flash("Logged in via LDAP", "success")
+
+            login_user(local_user)
             return redirect(url_for("calendar"))
 
         # --- Neither local nor LDAP authentication succeeded ---
-        flash("Account does not exist locally or in LDAP", "danger")
+        if local_user:
+            flash("Invalid password", "danger")
+        else:
+            flash("Account does not exist locally or in LDAP", "danger")
         return render_template("login.html")
 
     # GET request → render login page
@@ -166,7 +300,66 @@ def logout():
     return redirect(url_for("login"))  # redirect to login page
 
 # --- Calendar page ---
-from datetime import timedelta
+
+CALENDAR_CACHE_TTL = 30  # seconds a serialized /api/events payload or pending list stays in Redis
+CALENDAR_CACHE_VERSION_KEY = "cal:version"  # bumped on every event change
+
+def invalidate_calendar_cache():
+    """Make every cached /api/events payload and pending list stale; call after events change."""
+    if redis_client is not None:
+        try:
+            redis_client.incr(CALENDAR_CACHE_VERSION_KEY)
+        except redis.RedisError:
+            pass  # the change is already committed; stale payloads expire within CALENDAR_CACHE_TTL
+
+PENDING_CACHE_FIELDS = (
+    "id", "title", "event_type", "status", "start_datetime", "end_datetime", "created_by", "scope", "team_id"
+)  # columns the pending lists render
+
+def get_pending_vacations():
+    """Return all pending vacation requests (shared by /calendar and /pending_vacations)."""
+    # Cached in Redis under the calendar cache version, so any event change makes it stale
+    cache_key = None
+    if redis_client is not None:
+        try:
+            version = int(redis_client.get(CALENDAR_CACHE_VERSION_KEY) or 0)
+            cache_key = f"pending:{version}"
+            cached = redis_client.get(cache_key)
+        except redis.RedisError:
+            cache_key = cached = None  # cache outage: fall back to the database
+        if cached:
+            # Rebuilt as plain detached objects; the templates only read their columns
+            rows = orjson.loads(cached)
+            for row in rows:
+                row["start_datetime"] = datetime.fromisoformat(row["start_datetime"])
+                row["end_datetime"] = datetime.fromisoformat(row["end_datetime"])
+            return [Event(**row) for row in rows]
+
+    stmt = select(Event).where(Event.event_type == "vacation", Event.status == "pending")
+    if app.debug:
+        stmt = stmt.options(raiseload("*"))  # make accidental lazy loads fail loudly in development
+    pending = db.session.execute(stmt).scalars().all()
+
+    if cache_key:
+        try:
+            redis_client.setex(
+                cache_key,
+                CALENDAR_CACHE_TTL,
+                orjson.dumps([{field: getattr(e, field) for field in PENDING_CACHE_FIELDS} for e in pending])
+            )
+        except redis.RedisError:
+            pass  # caching is best-effort
+    return pending
+
+# Event types rendered as all-day entries in FullCalendar
+_ALL_DAY_TYPES = frozenset({"vacation"})
+
+# FullCalendar colors per event status
+_STATUS_COLORS = {
+    "pending": "#facc15",  # yellow
+    "approved": "#10b981",  # green
+    "rejected": "#ef4444"   # red
+}
 
 @app.route("/calendar")
 @login_required
@@ -174,56 +367,176 @@ def calendar():
     pending = []  # store pending vacation requests for admin
 
     if current_user.role == "admin":
-        # Admin sees all events
-        events = Event.query.all()
         # Admin also sees pending vacation requests separately
-        pending = Event.query.filter_by(
-            event_type="vacation",
-            status="pending"
-        ).all()
+        pending = get_pending_vacations()
+
+    # Events themselves are fetched by FullCalendar from /api/events
+    return render_template("calendar.html", user=current_user, pending=pending)
+
+def parse_range_param(name):
+    """Parse a FullCalendar ?start=/?end= ISO value into a naive datetime (None if absent)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    # Events are stored as naive local datetimes, so drop any UTC offset FullCalendar sends
+    return datetime.fromisoformat(value).replace(tzinfo=None)
+
+def build_events_payload(role, uid, tid, start, end):
+    """Query the events visible to a user in [start, end) and serialize them for FullCalendar."""
+    # Select only the columns FullCalendar needs, joined to the creator and
+    # their team, instead of hydrating full Event/User/Team objects.
+    # Built as lambda statements so the compiled SQL is cached across requests;
+    # the closure variables (start, end, uid, tid) become bound parameters.
+    if db.engine.dialect.name == "sqlite":
+        # Start/end are formatted by SQLite: date only for all-day events
+        # (end made exclusive with +1 day), full ISO timestamp otherwise.
+        stmt = lambda_stmt(lambda: select(
+            Event.id,
+            Event.title,
+            Event.event_type,
+            Event.status,
+            case(
+                (Event.event_type.in_(_ALL_DAY_TYPES), func.date(Event.start_datetime)),
+                else_=func.strftime("%Y-%m-%dT%H:%M:%S", Event.start_datetime)
+            ).label("start_iso"),
+            case(
+                (Event.event_type.in_(_ALL_DAY_TYPES), func.date(Event.end_datetime, "+1 day")),
+                else_=func.strftime("%Y-%m-%dT%H:%M:%S", Event.end_datetime)
+            ).label("end_iso"),
+            User.username,
+            Team.name
+        ).join(User, Event.created_by == User.id).outerjoin(Team, User.team_id == Team.id))
     else:
-        # Non-admin users see:
-        # - their own events
-        # - team events that are approved
-        events = Event.query.filter(
+        # date()/strftime() are SQLite-only; other databases return datetimes formatted below
+        stmt = lambda_stmt(lambda: select(
+            Event.id,
+            Event.title,
+            Event.event_type,
+            Event.status,
+            Event.start_datetime,
+            Event.end_datetime,
+            User.username,
+            Team.name
+        ).join(User, Event.created_by == User.id).outerjoin(Team, User.team_id == Team.id))
+
+    # Only events overlapping the visible range
+    stmt += lambda s: s.where(Event.end_datetime >= start, Event.start_datetime < end)
+
+    # Admin sees all events. Non-admin users see:
+    # - their own events
+    # - team events that are approved
+    # Users without a team match team events whose team_id IS NULL, as with a plain
+    # "team_id == None" comparison; a lambda would bind None as "= NULL" and match nothing.
+    if role != "admin" and tid is not None:
+        stmt += lambda s: s.where(
             or_(
-                Event.created_by == current_user.id,
+                Event.created_by == uid,
                 and_(
                     Event.scope == "team",
-                    Event.team_id == current_user.team_id,
+                    Event.team_id == tid,
                     Event.status == "approved"
                 )
             )
-        ).all()
+        )
+    elif role != "admin":
+        stmt += lambda s: s.where(
+            or_(
+                Event.created_by == uid,
+                and_(
+                    Event.scope == "team",
+                    Event.team_id.is_(None),
+                    Event.status == "approved"
+                )
+            )
+        )
+
+    events = db.session.execute(stmt).all()
 
     # Prepare events for FullCalendar JS
     event_list = []
-    for e in events:
-        all_day = (e.event_type == "vacation")  # vacations are all-day events
-        status_colors = {
-            "pending": "#facc15",  # yellow
-            "approved": "#10b981",  # green
-            "rejected": "#ef4444"   # red
-        }
+    for event_id, title, event_type, status, start_iso, end_iso, username, team_name in events:
+        all_day = event_type in _ALL_DAY_TYPES  # vacations are all-day events
+        if isinstance(start_iso, datetime):
+            # Not formatted in SQL (non-SQLite database)
+            if all_day:
+                start_iso = start_iso.date().isoformat()
+                end_iso = (end_iso.date() + timedelta(days=1)).isoformat()
+            else:
+                start_iso = start_iso.isoformat(timespec="seconds")
+                end_iso = end_iso.isoformat(timespec="seconds")
 
         event_list.append({
-            "id": e.id,
-            "title": e.title,
-            "start": e.start_datetime.isoformat() if not all_day else e.start_datetime.date().isoformat(),
-            "end": e.end_datetime.isoformat() if not all_day else (e.end_datetime.date() + timedelta(days=1)).isoformat(),
+            "id": event_id,
+            "title": title,
+            "start": start_iso,
+            "end": end_iso,
             "allDay": all_day,
-            "color": status_colors[e.status],
-            "status": e.status,
+            "color": _STATUS_COLORS[status],
+            "status": status,
             # include user info for display in calendar tooltip or popup
-            "username": e.creator.username,
-            "team": e.creator.team.name if e.creator.team else "No team"
+            "username": username,
+            "team": team_name if team_name else "No team"
         })
 
-    return render_template("calendar.html", events=event_list, user=current_user, pending=pending)
+    return orjson.dumps(event_list)
+
+# --- Calendar events feed (JSON for FullCalendar) ---
+@app.route("/api/events")
+@login_required
+def api_events():
+    # Read the logged-in user's attributes once instead of through the proxy on every use
+    role = current_user.role
+    uid = current_user.id
+    tid = current_user.team_id
+
+    # Visible date range requested by FullCalendar (end is exclusive)
+    try:
+        start = parse_range_param("start")
+        end = parse_range_param("end")
+    except ValueError:
+        return {"error": "Invalid start or end date"}, 400
+    if start is None or end is None:
+        # Always bound the result set to the visible window (FullCalendar sends both for every view)
+        return {"error": "start and end are required"}, 400
+
+    # Serve the serialized payload from Redis when possible. The version number is bumped
+    # whenever events change, which makes every older cached payload unreachable.
+    payload = None
+    cache_key = None
+    if redis_client is not None:
+        try:
+            version = int(redis_client.get(CALENDAR_CACHE_VERSION_KEY) or 0)
+            cache_key = f"cal:{version}:{role}:{uid}:{tid}:{start}:{end}"
+            payload = redis_client.get(cache_key)
+        except redis.RedisError:
+            cache_key = None  # cache outage: build the payload from the database
+
+    if payload is None:
+        payload = build_events_payload(role, uid, tid, start, end)
+        if cache_key:
+            try:
+                redis_client.setex(cache_key, CALENDAR_CACHE_TTL, payload)
+            except redis.RedisError:
+                pass  # caching is best-effort
+
+    # Weak ETag over the payload so an unchanged calendar view is answered with 304 Not Modified
+    response = app.response_class(payload, mimetype="application/json")
+    response.add_etag(weak=True)
+    return response.make_conditional(request)
 
 # --- Add Event page ---
 from datetime import datetime
 
+def parse_datetime_local(value):
+    """Parse an HTML5 datetime-local value ("YYYY-MM-DDTHH:MM"); raises ValueError if malformed."""
+    # fromisoformat() also accepts dates, seconds and UTC offsets; only the exact form shape is allowed
+    if not isinstance(value, str) or len(value) != 16 or value[10] != "T":
+        raise ValueError(f"Expected YYYY-MM-DDTHH:MM, got {value!r}")
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        raise ValueError(f"Expected a local time without UTC offset, got {value!r}")
+    return parsed
+
 @app.route("/add_event", methods=["GET", "POST"])
 @login_required
 def add_event():
@@ -234,12 +547,12 @@ def add_event():
         scope = request.form["scope"]
 
         # Convert datetime strings to Python datetime objects
-        start_dt = datetime.strptime(
-            request.form["start_datetime"], "%Y-%m-%dT%H:%M"
-        )
-        end_dt = datetime.strptime(
-            request.form["end_datetime"], "%Y-%m-%dT%H:%M"
-        )
+        try:
+            start_dt = parse_datetime_local(request.form["start_datetime"])
+            end_dt = parse_datetime_local(request.form["end_datetime"])
+        except ValueError:
+            flash("Invalid start or end date", "danger")
+            return redirect(url_for("calendar"))
 
         # Vacation requests by non-admin users must be approved
         if event_type == "vacation" and current_user.role != "admin":
@@ -264,11 +577,56 @@ def add_event():
         # Save event to database
         db.session.add(new_event)
         db.session.commit()
+        invalidate_calendar_cache()
         return redirect(url_for("calendar"))
 
     # GET request → show add event form
     return render_template("add_event.html", user=current_user)
 
+# --- Bulk event import ---
+
+@app.route("/add_events_bulk", methods=["POST"])
+@login_required
+def add_events_bulk():
+    # Expect a JSON list of events with the same fields as the add_event form
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return {"error": "Expected a list of events"}, 400
+
+    role = current_user.role
+    uid = current_user.id
+    tid = current_user.team_id
+
+    # Build plain row dicts (no ORM objects) for a Core executemany INSERT
+    rows = []
+    try:
+        for item in items:
+            title = item["title"]
+            event_type = item["event_type"]
+            scope = item["scope"]
+            # Text fields must be non-empty strings; anything else would fail at INSERT time
+            if not all(isinstance(v, str) and v for v in (title, event_type, scope)):
+                raise ValueError("title, event_type and scope must be non-empty strings")
+            rows.append({
+                "title": title,
+                "event_type": event_type,
+                "start_datetime": parse_datetime_local(item["start_datetime"]),
+                "end_datetime": parse_datetime_local(item["end_datetime"]),
+                # Vacation requests by non-admin users must be approved
+                "status": "pending" if event_type == "vacation" and role != "admin" else "approved",
+                "created_by": uid,
+                "scope": scope,
+                "team_id": tid if scope == "team" else None
+            })
+    except (KeyError, TypeError, ValueError):
+        return {"error": "Invalid event data"}, 400
+
+    # One executemany INSERT for the whole batch, in a single transaction
+    db.session.execute(Event.__table__.insert(), rows)
+    db.session.commit()
+    invalidate_calendar_cache()
+    return {"success": True, "created": len(rows)}
+
 # --- Pending vacations page (admin only) ---
 @app.route("/pending_vacations")
 @login_required
@@ -278,25 +636,23 @@ def pending_vacations():
         return redirect(url_for("calendar"))
 
     # Get all pending vacation events
-    pending = Event.query.filter_by(
-        event_type="vacation",
-        status="pending"
-    ).all()
+    pending = get_pending_vacations()
 
     return render_template("pending_vacations.html", pending=pending)
 
 # --- Approve event (admin only) ---
-from flask import jsonify
-
 @app.route("/approve_event/<int:event_id>", methods=["POST"])
 @login_required
 def approve_event(event_id):
     if current_user.role != "admin":
         return {"error": "Access denied"}, 403
 
-    event = Event.query.get_or_404(event_id)  # get event or 404
-    event.status = "approved"
+    # Single UPDATE ... WHERE id = ?, no SELECT or ORM instance needed
+    updated = Event.query.filter_by(id=event_id).update({"status": "approved"})
     db.session.commit()
+    if not updated:
+        abort(404)
+    invalidate_calendar_cache()
     return {"success": True, "status": "approved"}
 
 # --- Reject event (admin only) ---
@@ -306,69 +662,94 @@ def reject_event(event_id):
     if current_user.role != "admin":
         return {"error": "Access denied"}, 403
 
-    event = Event.query.get_or_404(event_id)
-    event.status = "rejected"
+    # Single UPDATE ... WHERE id = ?, no SELECT or ORM instance needed
+    updated = Event.query.filter_by(id=event_id).update({"status": "rejected"})
     db.session.commit()
+    if not updated:
+        abort(404)
+    invalidate_calendar_cache()
     return {"success": True, "status": "rejected"}
 
-# --- Initialize database, teams, and sample users ---
-with app.app_context():
-    db.create_all()  # create tables if they don't exist
-
-    # Create or fetch teams
-    team1 = Team.query.filter_by(name="Engineering").first()
-    if not team1:
-        team1 = Team(name="Engineering")
-        db.session.add(team1)
-
-    team2 = Team.query.filter_by(name="HR").first()
-    if not team2:
-        team2 = Team(name="HR")
-        db.session.add(team2)
-
-    db.session.commit()  # commit teams to assign IDs
-
-    # Initialize sample users (only if they don't exist)
-    admin = alice = bob = john = None
-
-    if not User.query.filter_by(username="admin").first():
-        admin = User(
-            username="admin",
-            password_hash=generate_password_hash("adminpass"),
-            role="admin"
-        )
+# --- Approve several vacations at once (admin only) ---
+@app.route("/approve_events", methods=["POST"])
+@login_required
+def approve_events():
+    if current_user.role != "admin":
+        return {"error": "Access denied"}, 403
 
-    if not User.query.filter_by(username="alice").first():
-        alice = User(
-            username="alice",
-            password_hash=generate_password_hash("alicepass"),
-            role="user",
-            team_id=team1.id
-        )
+    # Expect a JSON body like {"ids": [1, 2, 3]}
+    body = request.get_json(silent=True)
+    ids = body.get("ids") if isinstance(body, dict) else None
+    if not isinstance(ids, list) or not all(type(i) is int for i in ids):  # bool is an int subclass; reject it
+        return {"error": "Expected a list of event ids"}, 400
+
+    # Single UPDATE ... WHERE id IN (...) and one commit for the whole batch.
+    # Only still-pending vacations change, so a request rejected since the page loaded stays rejected.
+    updated_ids = db.session.execute(
+        update(Event)
+        .where(Event.id.in_(ids), Event.event_type == "vacation", Event.status == "pending")
+        .values(status="approved")
+        .returning(Event.id)
+    ).scalars().all()
+    db.session.commit()
+    invalidate_calendar_cache()
+    return {"success": True, "status": "approved", "updated": updated_ids}
 
-    if not User.query.filter_by(username="bob").first():
-        bob = User(
-            username="bob",
-            password_hash=generate_password_hash("bobpass"),
-            role="user",
-            team_id=team2.id
-        )
+# --- Initialize database, teams, and sample users ---
+# Explicit, tuned PBKDF2 cost for the local accounts: well below werkzeug's ~1M-iteration
+# default, but still a real KDF since these accounts can log in
+SEED_PASSWORD_METHOD = "pbkdf2:sha256:100000"
 
-    if not User.query.filter_by(username="john").first():
-        john = User(
-            username="john",
-            password_hash=generate_password_hash("johnpass"),
-            role="user",
-            team_id=team1.id
-        )
+def init_db():
+    """Create tables if they don't exist and seed teams and sample users."""
+    db.create_all()  # create tables if they don't exist
 
-    # Add any newly created users to database
-    users_to_add = [u for u in [admin, alice, bob, john] if u is not None]
-    if users_to_add:
-        db.session.add_all(users_to_add)
-        db.session.commit()
+    # Seed teams and sample users in a single transaction
+    with db.session.begin():
+        # Create or fetch teams with one IN query
+        teams = {t.name: t for t in Team.query.filter(Team.name.in_(["Engineering", "HR"])).all()}
+        for name in ["Engineering", "HR"]:
+            if name not in teams:
+                teams[name] = Team(name=name)
+                db.session.add(teams[name])
+        db.session.flush()  # assign IDs to new teams
+
+        # Initialize sample users (only if they don't exist)
+        sample_users = [
+            {"username": "admin", "password": "adminpass", "role": "admin", "team_id": None},
+            {"username": "alice", "password": "alicepass", "role": "user", "team_id": teams["Engineering"].id},
+            {"username": "bob", "password": "bobpass", "role": "user", "team_id": teams["HR"].id},
+            {"username": "john", "password": "johnpass", "role": "user", "team_id": teams["Engineering"].id},
+        ]
+        existing = {
+            u.username for u in User.query.filter(
+                User.username.in_([u["username"] for u in sample_users])
+            ).all()
+        }
 
-    # --- Run Flask app ---
-    # app.run(debug=True)
-    if __name__ == "__main__":
-        app.run(host="0.0.0.0", port=5000)
+        # Add any missing users with a single executemany INSERT
+        rows = [
+            {
+                "username": u["username"],
+                "password_hash": generate_password_hash(u["password"], method=SEED_PASSWORD_METHOD),
+                "role": u["role"],
+                "team_id": u["team_id"],
+                "is_ldap": False
+            }
+            for u in sample_users if u["username"] not in existing
+        ]
+        if rows:
+            db.session.execute(User.__table__.insert(), rows)
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create the database tables and sample data (run once with `flask init-db`)."""
+    init_db()
+    click.echo("Initialized the database.")
+
+# --- Run Flask app ---
+# app.run(debug=True)
+if __name__ == "__main__":
+    with app.app_context():
+        init_db()  # local development: bootstrap the database before serving
+    app.run(host="0.0.0.0", port=5000)